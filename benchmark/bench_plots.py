@@ -1,4 +1,6 @@
+import glob
 import os
+import re
 from typing import Optional
 
 import matplotlib.pyplot as plt
@@ -69,15 +71,24 @@ def save_plot_counter(
         filepath = os.path.join(directory, filename)
         return filepath
 
-    base, ext = os.path.splitext(filename)
-    counter = 1
     filepath = os.path.join(directory, filename)
+    if not os.path.exists(filepath):
+        return filepath
 
-    while os.path.exists(filepath):
-        filepath = os.path.join(directory, f"{base}_{counter}{ext}")
-        counter += 1
+    # Find the highest existing counter with a single directory listing
+    base, ext = os.path.splitext(filename)
+    pattern = os.path.join(
+        glob.escape(directory), f"{glob.escape(base)}_*{glob.escape(ext)}"
+    )
+    counter_regex = re.compile(rf"{re.escape(base)}_(\d+){re.escape(ext)}")
+    counters = [
+        int(match.group(1))
+        for path in glob.glob(pattern)
+        if (match := counter_regex.fullmatch(os.path.basename(path)))
+    ]
+    counter = max(counters, default=0) + 1
 
-    return filepath
+    return os.path.join(directory, f"{base}_{counter}{ext}")
 
 
 # Per-surrogate model plots
@@ -12,6 +12,9 @@ import yaml
 from surrogates.surrogate_classes import surrogate_classes
 from surrogates.surrogates import SurrogateModel
 
+# Name lookup for get_surrogate, built once from the registered surrogate classes
+_SURROGATES_BY_NAME = {surrogate.__name__: surrogate for surrogate in surrogate_classes}
+
 
 def check_surrogate(surrogate: str, conf: dict) -> None:
     """
@@ -249,7 +252,7 @@ def load_model(
     statedict_path = os.path.join(
         "trained", training_id, surr_name, f"{model_identifier}.pth"
     )
-    model.load_state_dict(torch.load(statedict_path))
+    model.load_state_dict(torch.load(statedict_path, weights_only=True))
     model.eval()
     return model
 
@@ -462,11 +465,7 @@ def get_surrogate(surrogate_name: str) -> SurrogateModel | None:
     Returns:
         SurrogateModel | None: The surrogate model class if it exists, otherwise None.
     """
-    for surrogate in surrogate_classes:
-        if surrogate_name == surrogate.__name__:
-            return surrogate
-
-    return None
+    return _SURROGATES_BY_NAME.get(surrogate_name)
 
 
 def format_time(mean_time, std_time):
@@ -10,7 +10,7 @@ from surrogates.DeepONet.deeponet_config import MultiONetBaseConfig
 from surrogates.surrogates import AbstractSurrogateModel
 from utils import time_execution, worker_init_fn
 
-from .utils import mass_conservation_loss
+from .utils import MassConservationLoss
 
 
 class BranchNet(nn.Module):
@@ -168,6 +168,8 @@ class MultiONet(OperatorNetwork):
         TypeError: Invalid configuration for MultiONet model.
     """
 
+    cuda_graph_inference = True
+
     def __init__(
         self,
         device: str | None = None,
@@ -313,7 +315,9 @@ class MultiONet(OperatorNetwork):
 
             clr = optimizer.param_groups[0]["lr"]
             print_loss = f"{train_losses[epoch].item():.2e}"
-            progress_bar.set_postfix({"loss": print_loss, "lr": f"{clr:.1e}"})
+            progress_bar.set_postfix_str(
+                f"loss={print_loss}, lr={clr:.1e}", refresh=False
+            )
             scheduler.step()
 
             if test_loader is not None:
@@ -339,8 +343,8 @@ class MultiONet(OperatorNetwork):
         crit = nn.MSELoss(reduction="sum")
         if hasattr(self.config, "masses") and self.config.masses is not None:
             weights = (1.0, self.config.massloss_factor)
-            crit = mass_conservation_loss(
-                self.config.masses, crit, weights, self.device
+            crit = MassConservationLoss(self.config.masses, crit, weights).to(
+                self.device
             )
         return crit
 
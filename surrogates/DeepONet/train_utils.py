@@ -1,47 +0,0 @@
-import torch
-import torch.nn as nn
-import torch.utils
-
-
-def mass_conservation_loss(
-    masses: list,
-    criterion=nn.MSELoss(reduction="sum"),
-    weights: tuple = (1, 1),
-    device: torch.device = torch.device("cpu"),
-):
-    """
-    Replaces the standard MSE loss with a sum of the standard MSE loss and a mass conservation loss.
-
-    :param masses: A list of masses for the chemical species.
-    :param criterion: The loss function to use for the standard loss.
-    :param weights: A 2-tuple of weights for the standard loss and the mass conservation loss.
-    :param device: The device to use for the loss function.
-
-    :return: A new loss function that includes the mass conservation loss.
-    """
-    masses = torch.tensor(masses, dtype=torch.float32, device=device)
-
-    def loss(outputs: torch.tensor, targets: torch.tensor) -> torch.tensor:
-        """
-        Loss function that includes the mass conservation loss.
-
-        :param outputs: The predicted values.
-        :param targets: The ground truth values.
-        """
-        standard_loss = criterion(outputs, targets)
-
-        # Calculate the weighted sum of each chemical quantity for predicted and ground truth,
-        # resulting in the total predicted mass and ground truth mass for each sample in the batch
-        predicted_mass = torch.sum(outputs * masses, dim=1)
-        true_mass = torch.sum(targets * masses, dim=1)
-
-        # Calculate the mass conservation loss as the MSE of the predicted mass vs. true mass
-        mass_loss = torch.abs(predicted_mass - true_mass).sum()
-        # Sum up the standard MSE loss and the mass conservation loss
-        total_loss = weights[0] * standard_loss + weights[1] * mass_loss
-
-        # print(f"Standard loss: {standard_loss.item()}, Mass loss: {mass_loss.item()}")
-
-        return total_loss
-
-    return loss
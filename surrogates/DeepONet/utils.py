@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import functools
+import glob
 import os
-import time
+import re
 from datetime import datetime
+
+import numpy as np
 import yaml
 from torch import nn
 import torch
@@ -18,9 +22,11 @@ def read_yaml_config(model_path):
     return config
 
 
+@functools.lru_cache(maxsize=None)
 def create_date_based_directory(base_dir=".", subfolder="models"):
     """
     Create a directory based on the current date (dd-mm format) inside a specified subfolder of the base directory.
+    The result is cached, so the date and directory are determined once per process.
 
     :param base_dir: The base directory where the subfolder and date-based directory will be created.
     :param subfolder: The subfolder inside the base directory to include before the date-based directory.
@@ -30,9 +36,8 @@ def create_date_based_directory(base_dir=".", subfolder="models"):
     current_date = datetime.now().strftime("%m-%d")
     full_path = os.path.join(base_dir, subfolder, current_date)
 
-    # Check if the directory exists, and create it if it doesn't
-    if not os.path.exists(full_path):
-        os.makedirs(full_path)
+    # Create the directory if it doesn't exist
+    os.makedirs(full_path, exist_ok=True)
 
     return full_path
 
@@ -40,16 +45,23 @@ def create_date_based_directory(base_dir=".", subfolder="models"):
 def save_plot_counter(filename, directory="plots"):
     # Initialize filename and counter
     filepath = os.path.join(directory, filename)
-    filebase, fileext = filename.split(".")
-    counter = 1
+    if not os.path.exists(filepath):
+        return filepath
+    filebase, fileext = filename.rsplit(".", 1)
 
-    # Check if the file exists and modify the filename accordingly
-    while os.path.exists(filepath):
-        filename = f"{filebase}_{counter}.{fileext}"
-        filepath = os.path.join(directory, filename)
-        counter += 1
+    # Find the highest existing counter with a single directory listing
+    pattern = os.path.join(
+        glob.escape(directory), f"{glob.escape(filebase)}_*.{glob.escape(fileext)}"
+    )
+    counter_regex = re.compile(rf"{re.escape(filebase)}_(\d+)\.{re.escape(fileext)}")
+    counters = [
+        int(match.group(1))
+        for path in glob.glob(pattern)
+        if (match := counter_regex.fullmatch(os.path.basename(path)))
+    ]
+    counter = max(counters, default=0) + 1
 
-    return filepath
+    return os.path.join(directory, f"{filebase}_{counter}.{fileext}")
 
 
 def get_project_path(relative_path):
@@ -83,57 +95,70 @@ def list_pth_files(directory: str = "models") -> list[str]:
     Returns:
         list[str]: A list of filenames without the .pth extension.
     """
-    files = os.listdir(directory)
-    pth_files = [file[:-4] for file in files if file.endswith(".pth")]
+    with os.scandir(directory) as entries:
+        pth_files = [
+            entry.name[:-4]
+            for entry in entries
+            if entry.name.endswith(".pth") and entry.is_file(follow_symlinks=False)
+        ]
     return pth_files
 
 
-def set_random_seed(gpu_id: int = 0):
-    # Combine the current time with the GPU ID to create a unique seed
-    seed = int(time.time()) + gpu_id
+def set_random_seed(gpu_id: int = 0) -> int:
+    # Mix OS entropy with the GPU ID, so that workers started within the same
+    # second (or sharing a clock) do not end up with the same seed
+    seed = int.from_bytes(os.urandom(8), "little") ^ (gpu_id * 0x9E3779B97F4A7C15)
+    seed &= (1 << 63) - 1
     torch.manual_seed(seed)
     torch.cuda.manual_seed_all(seed)  # If you're using CUDA
+    np.random.seed(seed & 0xFFFFFFFF)
+    return seed
 
 
-def mass_conservation_loss(
-    masses: list,
-    criterion=nn.MSELoss(reduction="sum"),
-    weights: tuple = (1, 1),
-    device: torch.device = torch.device("cpu"),
-):
+class MassConservationLoss(nn.Module):
     """
     Replaces the standard MSE loss with a sum of the standard MSE loss and a mass conservation loss.
+    The masses are registered as a buffer, so they move with the module on .to(device).
 
     :param masses: A list of masses for the chemical species.
-    :param criterion: The loss function to use for the standard loss.
+    :param criterion: The loss function to use for the standard loss. Defaults to nn.MSELoss(reduction="sum").
     :param weights: A 2-tuple of weights for the standard loss and the mass conservation loss.
-    :param device: The device to use for the loss function.
-
-    :return: A new loss function that includes the mass conservation loss.
     """
-    masses = torch.tensor(masses, dtype=torch.float32, device=device)
 
-    def loss(outputs: torch.tensor, targets: torch.tensor) -> torch.tensor:
+    def __init__(
+        self,
+        masses: list,
+        criterion: nn.Module | None = None,
+        weights: tuple = (1, 1),
+    ):
+        super().__init__()
+        if criterion is None:
+            criterion = nn.MSELoss(reduction="sum")
+        self.criterion = criterion
+        self.weights = weights
+        self.register_buffer(
+            "masses", torch.as_tensor(masses, dtype=torch.float32), persistent=False
+        )
+
+    def forward(self, outputs: torch.Tensor, targets: torch.Tensor) -> torch.Tensor:
         """
         Loss function that includes the mass conservation loss.
 
-        :param outputs: The predicted values.
+        :param outputs: The predicted values, with the chemicals in the last dimension.
         :param targets: The ground truth values.
         """
-        standard_loss = criterion(outputs, targets)
-
-        # Calculate the weighted sum of each chemical quantity for predicted and ground truth,
-        # resulting in the total predicted mass and ground truth mass for each sample in the batch
-        predicted_mass = torch.sum(outputs * masses, dim=1)
-        true_mass = torch.sum(targets * masses, dim=1)
-
-        # Calculate the mass conservation loss as the MSE of the predicted mass vs. true mass
-        mass_loss = torch.abs(predicted_mass - true_mass).sum()
+        if outputs.shape[-1] != self.masses.numel():
+            raise ValueError(
+                f"Expected {self.masses.numel()} chemicals in the last dimension, got {outputs.shape[-1]}."
+            )
+        standard_loss = self.criterion(outputs, targets)
+        masses = self.masses.to(dtype=outputs.dtype)
+
+        # The difference between predicted and true total mass is the mass-weighted sum
+        # of the residual over the chemicals (last dimension), computed in one pass
+        mass_residual = torch.einsum("b...c,c->b...", outputs - targets, masses)
+
+        # Calculate the mass conservation loss as the summed absolute mass difference
+        mass_loss = torch.linalg.vector_norm(mass_residual, ord=1)
         # Sum up the standard MSE loss and the mass conservation loss
-        total_loss = weights[0] * standard_loss + weights[1] * mass_loss
-
-        # print(f"Standard loss: {standard_loss.item()}, Mass loss: {mass_loss.item()}")
-
-        return total_loss
-
-    return loss
+        return self.weights[0] * standard_loss + self.weights[1] * mass_loss
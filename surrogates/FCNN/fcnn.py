@@ -42,6 +42,8 @@ class FullyConnectedNet(nn.Module):
 
 
 class FullyConnected(AbstractSurrogateModel):
+    cuda_graph_inference = True
+
     def __init__(
         self,
         device: str | None = None,
@@ -170,7 +172,9 @@ class FullyConnected(AbstractSurrogateModel):
 
             clr = optimizer.param_groups[0]["lr"]
             print_loss = f"{train_losses[epoch].item():.2e}"
-            progress_bar.set_postfix({"loss": print_loss, "lr": f"{clr:.1e}"})
+            progress_bar.set_postfix_str(
+                f"loss={print_loss}, lr={clr:.1e}", refresh=False
+            )
             scheduler.step()
 
             if test_loader is not None:
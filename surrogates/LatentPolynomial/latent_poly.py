@@ -157,7 +157,9 @@ class LatentPoly(AbstractSurrogateModel):
 
             clr = optimizer.param_groups[0]["lr"]
             print_loss = f"{losses[epoch, -1].item():.2e}"
-            progress_bar.set_postfix({"loss": print_loss, "lr": f"{clr:.1e}"})
+            progress_bar.set_postfix_str(
+                f"loss={print_loss}, lr={clr:.1e}", refresh=False
+            )
 
             with torch.inference_mode():
                 self.model.eval()
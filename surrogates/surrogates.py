@@ -1,5 +1,7 @@
 import dataclasses
+import itertools
 import os
+import pickle
 from abc import ABC, abstractmethod
 from typing import Any, TypeVar
 
@@ -12,6 +14,64 @@ from tqdm import tqdm
 
 from utils import create_model_dir
 
+try:
+    from yaml import CSafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as CSafeDumper
+
+# Array attributes larger than this are saved to a .npz file next to the model
+SIDECAR_MIN_BYTES = 2**16
+
+
+def _save_state_dict(state_dict: dict, path: str) -> None:
+    """
+    Save a state dict to a temporary file and rename it over path. Models loaded
+    with memory-mapped weights keep reading the replaced file, and the final path
+    never holds a partially written file.
+
+    Args:
+        state_dict (dict): The state dict to save.
+        path (str): The path of the saved file.
+    """
+    tmp_path = f"{path}.tmp"
+    torch.save(state_dict, tmp_path, _use_new_zipfile_serialization=True)
+    os.replace(tmp_path, path)
+
+
+def _identity_affine(params: dict | None) -> tuple[float, float]:
+    return 1.0, 0.0
+
+
+def _minmax_affine(params: dict) -> tuple[float, float]:
+    return (params["max"] - params["min"]) / 2, (params["max"] + params["min"]) / 2
+
+
+def _standardise_affine(params: dict) -> tuple[float, float]:
+    return params["std"], params["mean"]
+
+
+# Maps the normalisation mode to the (scale, bias) of the affine map that undoes it
+DENORMALISATION_AFFINES = {
+    "disable": _identity_affine,
+    "minmax": _minmax_affine,
+    "standardise": _standardise_affine,
+    "standardize": _standardise_affine,
+}
+
+
+def _shallow_asdict(cfg: Any) -> dict:
+    """
+    Convert a dataclass instance to a dict without the recursive deep copy performed
+    by dataclasses.asdict. The values are the field values themselves.
+
+    Args:
+        cfg (Any): The dataclass instance.
+
+    Returns:
+        dict: The field names mapped to their values.
+    """
+    return {field.name: getattr(cfg, field.name) for field in dataclasses.fields(cfg)}
+
 
 class AbstractSurrogateModel(ABC, nn.Module):
     """
@@ -38,6 +98,9 @@ class AbstractSurrogateModel(ABC, nn.Module):
         n_timesteps (int): The number of timesteps.
         L1 (nn.L1Loss): The L1 loss function.
         config (dict): The configuration dictionary.
+        cuda_graph_inference (bool): Whether the forward pass is free of host
+            synchronisation and data-dependent shapes, so that prediction on CUDA
+            devices may replay it as a captured CUDA graph. Defaults to False.
 
     Methods:
 
@@ -63,9 +126,20 @@ class AbstractSurrogateModel(ABC, nn.Module):
         ) -> None:
             Trains the model on the training data. Sets the train_loss and test_loss attributes.
 
-        predict(data_loader: DataLoader) -> tuple[torch.Tensor, torch.Tensor]:
+        predict(
+            data_loader: DataLoader,
+            to_host: bool,
+        ) -> tuple[torch.Tensor, torch.Tensor]:
             Evaluates the model on the given data loader.
 
+        predict_batched(
+            dataset: np.ndarray,
+            timesteps: np.ndarray,
+            max_batch_size: int | None,
+            to_host: bool,
+        ) -> tuple[torch.Tensor, torch.Tensor]:
+            Evaluates the model on a dataset using the largest batches that fit into memory.
+
         save(
             model_name: str,
             subfolder: str,
@@ -77,6 +151,16 @@ class AbstractSurrogateModel(ABC, nn.Module):
         load(training_id: str, surr_name: str, model_identifier: str) -> None:
             Loads a trained surrogate model.
 
+        export_trt(
+            submodule: str,
+            sample_input: Tensor,
+            model_name: str,
+            base_dir: str,
+            training_id: str,
+            fp16: bool,
+        ) -> None:
+            Converts a submodule to TensorRT and saves the engine next to the model.
+
         setup_progress_bar(epochs: int, position: int, description: str) -> tqdm:
             Helper function to set up a progress bar for training.
 
@@ -84,6 +168,8 @@ class AbstractSurrogateModel(ABC, nn.Module):
             Denormalizes the data back to the original scale.
     """
 
+    cuda_graph_inference: bool = False
+
     def __init__(
         self,
         device: str | None = None,
@@ -102,6 +188,12 @@ class AbstractSurrogateModel(ABC, nn.Module):
         self.L1 = nn.L1Loss()
         self.config = config if config is not None else {}
         self.train_duration = None
+        # Captured CUDA graphs for prediction, see _get_cuda_graphs
+        self._cuda_graphs = {}
+        self._cuda_graph_params = None
+        # The (name, module) of a submodule replaced by a TensorRT engine, see _load_trt
+        self._trt_replaced = None
+        self._prepare_denorm_cache()
 
     @abstractmethod
     def forward(self, inputs: Any) -> tuple[Tensor, Tensor]:
@@ -168,6 +260,7 @@ class AbstractSurrogateModel(ABC, nn.Module):
     def predict(
         self,
         data_loader: DataLoader,
+        to_host: bool = False,
     ) -> tuple[torch.Tensor, torch.Tensor]:
         """
         Evaluate the model on the given dataloader.
@@ -175,46 +268,241 @@ class AbstractSurrogateModel(ABC, nn.Module):
         Args:
             data_loader (DataLoader): The DataLoader object containing the data the
                 model is evaluated on.
+            to_host (bool, optional): Whether to collect the outputs of a model on a
+                CUDA device in pinned host memory instead of device memory. Defaults
+                to False.
 
         Returns:
-            tuple[torch.Tensor, torch.Tensor]: The predictions and targets.
+            tuple[torch.Tensor, torch.Tensor]: The predictions and targets, on the
+                model device unless to_host is set.
         """
-
-        # infer output size
         with torch.inference_mode():
-            dummy_inputs = next(iter(data_loader))
+            if to_host and str(self.device).startswith("cuda"):
+                predictions, targets = self._predict_to_host(data_loader)
+            else:
+                preds_list, targs_list = [], []
+                for inputs in data_loader:
+                    preds, targs = self.forward(inputs)
+                    preds_list.append(preds)
+                    targs_list.append(targs)
+                predictions = torch.cat(preds_list, dim=0)
+                targets = torch.cat(targs_list, dim=0)
+
+            predictions = self.denormalize(predictions)
+            targets = self.denormalize(targets)
+
+        predictions = predictions.reshape(-1, self.n_timesteps, self.n_chemicals)
+        targets = targets.reshape(-1, self.n_timesteps, self.n_chemicals)
+
+        return predictions, targets
+
+    def _predict_to_host(
+        self,
+        data_loader: DataLoader,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Run the model over the dataloader on a CUDA device and collect the outputs in
+        pinned host memory. Each batch is copied asynchronously on alternating side
+        streams, so that the device-to-host transfer overlaps with the next forward
+        pass and the outputs never occupy GPU memory. For models that support it, the
+        forward pass of full-size batches is replayed from captured CUDA graphs to
+        avoid the kernel launch overhead. Must be called in inference mode.
+
+        Args:
+            data_loader (DataLoader): The DataLoader object containing the data the
+                model is evaluated on.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: The (normalised) predictions and targets.
+        """
+        # One graph per copy stream, so that a replay never overwrites static outputs
+        # that are still being copied to the host. Compiled forwards are left alone,
+        # and graphs are not used while training, when the weights keep changing.
+        dummy_inputs = next(iter(data_loader))
+        graphs = None
+        if (
+            self.cuda_graph_inference
+            and not self.training
+            and "forward" not in self.__dict__
+        ):
+            graphs = self._get_cuda_graphs(dummy_inputs)
+            # infer output size from the static outputs
+            dummy_outputs = graphs[0][2][0]
+        else:
+            # infer output size
             dummy_outputs, _ = self.forward(dummy_inputs)
-            batch_size, out_shape = (
-                dummy_outputs.shape[0],
-                dummy_outputs.shape[-(dummy_outputs.ndim - 1) :],
-            )
+        batch_size, out_shape = (
+            dummy_outputs.shape[0],
+            dummy_outputs.shape[-(dummy_outputs.ndim - 1) :],
+        )
 
         # pre-allocate buffers for predictions and targets
-        size = (batch_size * len(data_loader), *out_shape)
-        predictions = torch.zeros(size, dtype=dummy_outputs.dtype).to(self.device)
-        targets = torch.zeros(size, dtype=dummy_outputs.dtype).to(self.device)
+        try:
+            n_samples = len(data_loader.dataset)
+        except TypeError:
+            # datasets without __len__ fall back to an upper bound
+            n_samples = batch_size * len(data_loader)
+        size = (n_samples, *out_shape)
+        predictions = torch.empty(size, dtype=dummy_outputs.dtype, pin_memory=True)
+        targets = torch.empty(size, dtype=dummy_outputs.dtype, pin_memory=True)
+        streams = [torch.cuda.Stream(self.device) for _ in range(2)]
+        current_stream = torch.cuda.current_stream(self.device)
 
         processed_samples = 0
 
-        with torch.inference_mode():
-            for i, inputs in enumerate(data_loader):
+        for i, inputs in enumerate(data_loader):
+            stream = streams[i & 1]
+            if graphs is not None and all(
+                tensor.shape == static.shape
+                for tensor, static in zip(inputs, graphs[i & 1][1])
+            ):
+                graph, static_inputs, static_outputs = graphs[i & 1]
+                current_stream.wait_stream(stream)
+                for static, tensor in zip(static_inputs, inputs):
+                    static.copy_(tensor)
+                graph.replay()
+                preds, targs = static_outputs
+            else:
+                # Ragged batches (e.g. the last one) run eagerly
                 preds, targs = self.forward(inputs)
-                batch_size = preds.shape[0]
-                predictions[i * batch_size : (i + 1) * batch_size, ...] = preds
-                targets[i * batch_size : (i + 1) * batch_size, ...] = targs
-                processed_samples += batch_size
+            batch_size = preds.shape[0]
+            start, end = processed_samples, processed_samples + batch_size
+            stream.wait_stream(current_stream)
+            with torch.cuda.stream(stream):
+                predictions[start:end, ...].copy_(preds, non_blocking=True)
+                targets[start:end, ...].copy_(targs, non_blocking=True)
+            # Keep the allocator from reusing the memory before the copy is done
+            preds.record_stream(stream)
+            targs.record_stream(stream)
+            processed_samples += batch_size
+
+        torch.cuda.synchronize(self.device)
+
+        # Slice the buffers to include only the processed samples (a view, which only
+        # differs from the full buffer if the loader drops its last batch)
+        return predictions[:processed_samples, ...], targets[:processed_samples, ...]
+
+    def _get_cuda_graphs(
+        self,
+        sample_inputs: tuple[torch.Tensor, ...],
+    ) -> list[tuple[torch.cuda.CUDAGraph, list[torch.Tensor], tuple[Tensor, Tensor]]]:
+        """
+        Get the two captured forward graphs for inputs shaped like sample_inputs,
+        capturing them on first use. The graphs are cached on the model, keyed by the
+        input shapes and dtypes. They read the weights from the addresses at capture
+        time, so the cache is dropped when the parameters are reallocated (e.g. by
+        load or .to), while in-place weight updates are picked up by the graphs.
 
-        # Slice the buffers to include only the processed samples
-        predictions = predictions[:processed_samples, ...]
-        targets = targets[:processed_samples, ...]
+        Args:
+            sample_inputs (tuple[torch.Tensor, ...]): A batch from the dataloader.
 
-        predictions = self.denormalize(predictions)
-        targets = self.denormalize(targets)
+        Returns:
+            list: Two (graph, static inputs, static outputs) tuples.
+        """
+        params = tuple(
+            tensor.data_ptr()
+            for tensor in itertools.chain(self.parameters(), self.buffers())
+        )
+        if params != self._cuda_graph_params:
+            self._cuda_graphs = {}
+            self._cuda_graph_params = params
+        key = tuple((tensor.shape, tensor.dtype) for tensor in sample_inputs)
+        if key not in self._cuda_graphs:
+            self._cuda_graphs[key] = [
+                self._capture_forward(sample_inputs) for _ in range(2)
+            ]
+        return self._cuda_graphs[key]
+
+    def _capture_forward(
+        self,
+        sample_inputs: tuple[torch.Tensor, ...],
+    ) -> tuple[torch.cuda.CUDAGraph, list[torch.Tensor], tuple[Tensor, Tensor]]:
+        """
+        Capture the forward pass for inputs shaped like sample_inputs in a CUDA graph.
+        The graph reads from and writes to static tensors, so a replay only requires
+        copying the batch into the static inputs. Must be called in inference mode.
 
-        predictions = predictions.reshape(-1, self.n_timesteps, self.n_chemicals)
-        targets = targets.reshape(-1, self.n_timesteps, self.n_chemicals)
+        Args:
+            sample_inputs (tuple[torch.Tensor, ...]): A batch from the dataloader,
+                which fixes the shapes of the captured graph.
 
-        return predictions, targets
+        Returns:
+            tuple: The graph, its static inputs and its static outputs.
+        """
+        static_inputs = [tensor.clone() for tensor in sample_inputs]
+
+        # Warm up on a side stream, as required before capturing
+        warmup_stream = torch.cuda.Stream(self.device)
+        warmup_stream.wait_stream(torch.cuda.current_stream(self.device))
+        with torch.cuda.stream(warmup_stream):
+            for _ in range(3):
+                self.forward(static_inputs)
+        torch.cuda.current_stream(self.device).wait_stream(warmup_stream)
+
+        graph = torch.cuda.CUDAGraph()
+        # Only this thread's CUDA calls are checked during capture, so that the
+        # threads training on other devices in parallel_training are unaffected
+        with torch.cuda.graph(graph, capture_error_mode="thread_local"):
+            static_outputs = self.forward(static_inputs)
+        return graph, static_inputs, static_outputs
+
+    def predict_batched(
+        self,
+        dataset: np.ndarray,
+        timesteps: np.ndarray,
+        max_batch_size: int | None = None,
+        to_host: bool = True,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Evaluate the model on a dataset using the largest batches that fit into memory,
+        so that many trajectories are inferred in each forward pass.
+        On CUDA devices the number of trajectories per batch is estimated from the
+        free device memory, otherwise the whole dataset is processed in one batch.
+
+        Args:
+            dataset (np.ndarray): The data with shape (n_samples, n_timesteps, n_chemicals).
+            timesteps (np.ndarray): The timesteps.
+            max_batch_size (int, optional): The maximum number of trajectories per
+                batch. Defaults to None (no limit).
+            to_host (bool, optional): Whether to collect the outputs of a model on a
+                CUDA device in pinned host memory, so that they do not compete with
+                the batches for device memory. Defaults to True.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: The predictions and targets.
+        """
+        n_samples = dataset.shape[0]
+        trajectories_per_batch = n_samples
+        if str(self.device).startswith("cuda"):
+            free_bytes, _ = torch.cuda.mem_get_info(self.device)
+            bytes_per_trajectory = self.n_chemicals * self.n_timesteps * 4  # float32
+            # Budget a quarter of the free memory for the outputs, leaving headroom
+            # for the intermediate activations
+            trajectories_per_batch = free_bytes // (4 * bytes_per_trajectory)
+        if max_batch_size is not None:
+            trajectories_per_batch = min(trajectories_per_batch, max_batch_size)
+        trajectories_per_batch = max(1, min(trajectories_per_batch, n_samples))
+
+        # The surrogates differ in how many dataset items make up one trajectory,
+        # so the dataset is built by the surrogate and only re-batched here
+        data_loader, _, _ = self.prepare_data(
+            dataset_train=dataset,
+            dataset_test=None,
+            dataset_val=None,
+            timesteps=timesteps,
+            batch_size=1,
+            shuffle=False,
+        )
+        items_per_trajectory = len(data_loader.dataset) // n_samples
+        data_loader = DataLoader(
+            data_loader.dataset,
+            batch_size=trajectories_per_batch * items_per_trajectory,
+            shuffle=False,
+            num_workers=0,
+            collate_fn=data_loader.collate_fn,
+        )
+
+        return self.predict(data_loader, to_host=to_host)
 
     def save(
         self,
@@ -238,13 +526,12 @@ class AbstractSurrogateModel(ABC, nn.Module):
         model_dir = create_model_dir(base_dir, subfolder)
 
         # Load and clean the hyperparameters
-        hyperparameters = dataclasses.asdict(self.config)
         remove_keys = ["masses"]
-        for key in remove_keys:
-            hyperparameters.pop(key, None)
-        for key in hyperparameters.keys():
-            if isinstance(hyperparameters[key], nn.Module):
-                hyperparameters[key] = hyperparameters[key].__class__.__name__
+        hyperparameters = {
+            key: value.__class__.__name__ if isinstance(value, nn.Module) else value
+            for key, value in _shallow_asdict(self.config).items()
+            if key not in remove_keys
+        }
 
         # Check if the model has some attributes. If so, add them to the hyperparameters
         check_attributes = [
@@ -264,6 +551,7 @@ class AbstractSurrogateModel(ABC, nn.Module):
         )
         hyperparameters["train_duration"] = self.train_duration
         self.normalisation = data_params
+        self._prepare_denorm_cache()
         hyperparameters["normalisation"] = data_params
 
         # Reduce the precision of the losses and accuracy
@@ -271,25 +559,43 @@ class AbstractSurrogateModel(ABC, nn.Module):
             value = getattr(self, attribute)
             if value is not None:
                 if isinstance(value, torch.Tensor):
-                    value = value.cpu().detach().numpy()
-                if isinstance(value, np.ndarray):
-                    value = value.astype(np.float16)
+                    # cast before the transfer to halve the copied volume
+                    value = value.detach().half().cpu().numpy()
+                elif isinstance(value, np.ndarray):
+                    value = value.astype(np.float16, copy=False)
                 setattr(self, attribute, value)
 
         # Save the hyperparameters as a yaml file
         hyperparameters_path = os.path.join(model_dir, f"{model_name}.yaml")
         with open(hyperparameters_path, "w", encoding="utf-8") as file:
-            yaml.dump(hyperparameters, file)
+            yaml.dump(hyperparameters, file, Dumper=CSafeDumper, sort_keys=False)
 
         save_attributes = {
             k: v
             for k, v in self.__dict__.items()
-            if k != "state_dict" and not k.startswith("_")
+            if k not in ("state_dict", "forward") and not k.startswith("_")
         }
-        model_dict = {"state_dict": self.state_dict(), "attributes": save_attributes}
+
+        # Large arrays are kept out of the pickle and stored in a numpy sidecar file
+        array_keys = [
+            key
+            for key, value in save_attributes.items()
+            if isinstance(value, np.ndarray) and value.nbytes > SIDECAR_MIN_BYTES
+        ]
+        if array_keys:
+            arrays = {key: save_attributes.pop(key) for key in array_keys}
+            arrays_path = os.path.join(model_dir, f"{model_name}_arrays.npz")
+            np.savez_compressed(arrays_path, **arrays)
+
+        # The state dict is saved on its own so that it can be loaded with
+        # weights_only=True and memory-mapped; the remaining attributes are pickled
+        model_dict = {"attributes": save_attributes, "array_keys": array_keys}
+        attributes_path = os.path.join(model_dir, f"{model_name}.attrs.pkl")
+        with open(attributes_path, "wb") as file:
+            pickle.dump(model_dict, file, protocol=pickle.HIGHEST_PROTOCOL)
 
         model_path = os.path.join(model_dir, f"{model_name}.pth")
-        torch.save(model_dict, model_path)
+        _save_state_dict(self.state_dict(), model_path)
 
     def load(
         self,
@@ -297,6 +603,8 @@ class AbstractSurrogateModel(ABC, nn.Module):
         surr_name: str,
         model_identifier: str,
         model_dir: str | None = None,
+        compile_inference: bool = False,
+        use_trt: bool = False,
     ) -> None:
         """
         Load a trained surrogate model.
@@ -305,10 +613,27 @@ class AbstractSurrogateModel(ABC, nn.Module):
             training_id (str): The training identifier.
             surr_name (str): The name of the surrogate model.
             model_identifier (str): The identifier of the model (e.g., 'main').
+            model_dir (str, optional): The directory containing the trained models.
+                Defaults to "trained" in the current working directory.
+            compile_inference (bool, optional): Whether to compile the forward pass
+                with torch.compile for faster inference. Only applies to CUDA devices.
+            use_trt (bool, optional): Whether to use the TensorRT engine saved by
+                export_trt, if there is one. Requires the torch2trt package.
 
         Returns:
             None. The model is loaded in place.
         """
+        # Drop a forward compiled by a previous load, it is recompiled below if requested
+        self.__dict__.pop("forward", None)
+
+        # Put back a submodule replaced by a previous TensorRT load, so that the
+        # state dict matches the model again
+        if self._trt_replaced is not None:
+            name, module = self._trt_replaced
+            parent_name, _, child_name = name.rpartition(".")
+            setattr(self.get_submodule(parent_name), child_name, module)
+            self._trt_replaced = None
+
         if model_dir is None:
             model_dict_path = os.path.join(
                 os.getcwd(), "trained", training_id, surr_name, f"{model_identifier}.pth"
@@ -317,20 +642,114 @@ class AbstractSurrogateModel(ABC, nn.Module):
             model_dict_path = os.path.join(
                 model_dir, training_id, surr_name, f"{model_identifier}.pth"
             )
-        model_dict = torch.load(model_dict_path, map_location=self.device)
-        self.load_state_dict(model_dict["state_dict"])
+        attributes_path = f"{os.path.splitext(model_dict_path)[0]}.attrs.pkl"
+        if os.path.exists(attributes_path):
+            state_dict = torch.load(
+                model_dict_path, map_location=self.device, mmap=True, weights_only=True
+            )
+            with open(attributes_path, "rb") as file:
+                model_dict = pickle.load(file)
+        else:
+            # Models saved with the state dict and attributes in a single file, which
+            # pickles arbitrary objects and therefore cannot be loaded weights-only
+            model_dict = torch.load(
+                model_dict_path, map_location=self.device, weights_only=False
+            )
+            state_dict = model_dict["state_dict"]
+        # The loaded tensors are already on the target device, so they replace the
+        # initial parameters instead of being copied into them
+        self.load_state_dict(state_dict, assign=True)
         for key, value in model_dict["attributes"].items():
             # remove self.device from the attributes
             if key == "device":
                 continue
             else:
                 setattr(self, key, value)
+        array_keys = model_dict.get("array_keys", [])
+        if array_keys:
+            arrays_path = f"{os.path.splitext(model_dict_path)[0]}_arrays.npz"
+            with np.load(arrays_path) as arrays:
+                for key in array_keys:
+                    setattr(self, key, arrays[key])
+        self._prepare_denorm_cache()
         self.to(self.device)
         self.eval()
 
+        trt_path = f"{os.path.splitext(model_dict_path)[0]}.trt.pth"
+        if use_trt and os.path.exists(trt_path):
+            self._load_trt(trt_path)
+
+        if compile_inference and str(self.device).startswith("cuda"):
+            # The default mode fuses kernels but does not use CUDA graphs, whose static
+            # output buffers would be overwritten while predict() still copies them
+            self.forward = torch.compile(self.forward, fullgraph=False)
+
+    def export_trt(
+        self,
+        submodule: str,
+        sample_input: Tensor,
+        model_name: str,
+        base_dir: str,
+        training_id: str,
+        fp16: bool = True,
+    ) -> None:
+        """
+        Convert a submodule of the model to TensorRT with torch2trt and save the engine
+        next to the model as "<model_name>.trt.pth". Requires the optional torch2trt
+        package. The submodule must map a single tensor to a tensor in float32, e.g.
+        "model" for FullyConnected or "model.ode.mlp" for the vector field of
+        LatentNeuralODE (the integration itself stays in PyTorch).
+
+        Args:
+            submodule (str): The dotted name of the submodule to convert.
+            sample_input (Tensor): A sample input for the submodule, its batch size
+                is used as the maximum batch size of the engine.
+            model_name (str): The name of the model.
+            base_dir (str): The base directory the model is saved in.
+            training_id (str): The training identifier.
+            fp16 (bool, optional): Whether to build the engine in half precision.
+                Defaults to True.
+        """
+        from torch2trt import torch2trt
+
+        trt_module = torch2trt(
+            self.get_submodule(submodule).eval(),
+            [sample_input],
+            fp16_mode=fp16,
+            max_batch_size=sample_input.shape[0],
+            max_workspace_size=1 << 30,
+        )
+        model_dir = os.path.join(base_dir, training_id, self.__class__.__name__)
+        trt_path = os.path.join(model_dir, f"{model_name}.trt.pth")
+        torch.save(
+            {"submodule": submodule, "state_dict": trt_module.state_dict()}, trt_path
+        )
+
+    def _load_trt(self, trt_path: str) -> None:
+        """
+        Replace a submodule by the TensorRT engine saved by export_trt.
+
+        Args:
+            trt_path (str): The path to the saved TensorRT engine.
+        """
+        from torch2trt import TRTModule
+
+        # The engine is stored as raw bytes next to plain containers, so the file can
+        # be loaded weights-only
+        trt_dict = torch.load(trt_path, map_location=self.device, weights_only=True)
+        trt_module = TRTModule()
+        trt_module.load_state_dict(trt_dict["state_dict"])
+        # The original is kept in a tuple, which nn.Module does not register as a child
+        name = trt_dict["submodule"]
+        self._trt_replaced = (name, self.get_submodule(name))
+        parent_name, _, child_name = name.rpartition(".")
+        setattr(self.get_submodule(parent_name), child_name, trt_module)
+
     def setup_progress_bar(self, epochs: int, position: int, description: str):
         """
-        Helper function to set up a progress bar for training.
+        Helper function to set up a progress bar for training. The bar throttles its
+        own redraws, so callers should update the postfix with
+        set_postfix_str(..., refresh=False) instead of forcing a redraw every epoch.
 
         Args:
             epochs (int): The number of epochs.
@@ -347,35 +766,39 @@ class AbstractSurrogateModel(ABC, nn.Module):
             position=position,
             leave=False,
             bar_format=bar_format,
+            mininterval=0.5,
+            maxinterval=2.0,
+            miniters=max(1, epochs // 200),
         )
-        progress_bar.set_postfix(
-            {"loss": f"{0:.2e}", "lr": f"{self.config.learning_rate:.1e}"}
+        progress_bar.set_postfix_str(
+            f"loss={0:.2e}, lr={self.config.learning_rate:.1e}", refresh=False
         )
         return progress_bar
 
+    def _prepare_denorm_cache(self) -> None:
+        """
+        Precompute the scale and bias of the affine map that undoes the normalisation,
+        so that denormalize reduces to a single multiply-add. The values are stored as
+        zero-dimensional host tensors, which can be combined with data on any device.
+        """
+        mode = self.normalisation.get("mode") if self.normalisation else None
+        affine = DENORMALISATION_AFFINES.get(mode, _identity_affine)
+        scale, bias = affine(self.normalisation)
+
+        self._denorm_scale = torch.as_tensor(scale, dtype=torch.float64)
+        self._denorm_bias = torch.as_tensor(bias, dtype=torch.float64)
+
     def denormalize(self, data: torch.Tensor) -> torch.Tensor:
         """
-        Denormalize the data.
+        Denormalize the data in place.
 
         Args:
-            data (np.ndarray): The data to denormalize.
+            data (torch.Tensor): The data to denormalize.
 
         Returns:
-            np.ndarray: The denormalized data.
+            torch.Tensor: The denormalized data.
         """
-        if self.normalisation is not None:
-            if self.normalisation["mode"] == "disabled":
-                ...
-            elif self.normalisation["mode"] == "minmax":
-                dmax = self.normalisation["max"]
-                dmin = self.normalisation["min"]
-                data = (data + 1) * (dmax - dmin) / 2 + dmin
-            elif self.normalisation["mode"] == "standardize":
-                mean = self.normalisation["mean"]
-                std = self.normalisation["std"]
-                data = data * std + mean
-
-        return data
+        return data.mul_(self._denorm_scale).add_(self._denorm_bias)
 
 
 SurrogateModel = TypeVar("SurrogateModel", bound=AbstractSurrogateModel)
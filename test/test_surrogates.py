@@ -1,9 +1,14 @@
 import random
 import string
+import sys
+import types
 
+import numpy as np
 import pytest
 import torch
 
+from data.data_utils import normalize_data
+from surrogates.DeepONet.utils import MassConservationLoss
 from surrogates.surrogate_classes import surrogate_classes
 
 DEVICE = "cuda:0" if torch.cuda.is_available() else "cpu"
@@ -18,12 +23,18 @@ def instance(request):
     return request.param(DEVICE, N_CHEMICALS, N_TIMESTEPS)
 
 
-@pytest.fixture
-def dataloaders(instance):
+@pytest.fixture(scope="module")
+def data():
     data_train = torch.rand((3, N_TIMESTEPS, N_CHEMICALS), dtype=torch.float64)
     data_test = torch.rand((3, N_TIMESTEPS, N_CHEMICALS), dtype=torch.float64)
     data_val = torch.rand((3, N_TIMESTEPS, N_CHEMICALS), dtype=torch.float64)
     timesteps = torch.rand(N_TIMESTEPS, dtype=torch.float64)
+    return data_train, data_test, data_val, timesteps
+
+
+@pytest.fixture
+def dataloaders(instance, data):
+    data_train, data_test, data_val, timesteps = data
     shuffle = True
     dataloader_train, dataloader_test, dataloader_val = instance.prepare_data(
         data_train, data_test, data_val, timesteps, BATCH_SIZE, shuffle
@@ -56,6 +67,73 @@ def test_predict(instance, dataloaders):
     assert targets.shape == torch.Size([3, N_TIMESTEPS, N_CHEMICALS]), f"targets has wrong shape: {targets.shape} != [3, {N_TIMESTEPS}, {N_CHEMICALS}]"
 
 
+def test_predict_batched(instance):
+    data = torch.rand((3, N_TIMESTEPS, N_CHEMICALS), dtype=torch.float64)
+    timesteps = torch.linspace(0, 1, N_TIMESTEPS, dtype=torch.float64)
+    predictions, targets = instance.predict_batched(data, timesteps, max_batch_size=2)
+
+    assert predictions.shape == torch.Size([3, N_TIMESTEPS, N_CHEMICALS]), f"predictions has wrong shape: {predictions.shape} != [3, {N_TIMESTEPS}, {N_CHEMICALS}]"
+    assert targets.shape == torch.Size([3, N_TIMESTEPS, N_CHEMICALS]), f"targets has wrong shape: {targets.shape} != [3, {N_TIMESTEPS}, {N_CHEMICALS}]"
+
+    # The re-batched outputs must match an unshuffled evaluation of the same data
+    dataloader, _, _ = instance.prepare_data(data, None, None, timesteps, BATCH_SIZE, False)
+    expected_predictions, expected_targets = instance.predict(dataloader)
+    # float32 kernels may round differently for other batch sizes
+    assert torch.allclose(predictions.cpu(), expected_predictions.cpu(), atol=1e-6), "predictions differ from predict"
+    assert torch.allclose(targets.cpu(), expected_targets.cpu(), atol=1e-6), "targets differ from predict"
+
+
+def test_cuda_graph_cache(instance, monkeypatch):
+    captures = []
+    monkeypatch.setattr(instance, "_capture_forward", lambda inputs: captures.append(inputs) or len(captures))
+    inputs = (torch.zeros(4, 3), torch.zeros(4, 2))
+    assert instance._get_cuda_graphs(inputs) == [1, 2], "graphs were not captured once per stream"
+    assert instance._get_cuda_graphs(inputs) == [1, 2], "graphs were recaptured for the same shapes"
+    assert instance._get_cuda_graphs((torch.zeros(2, 3), torch.zeros(2, 2))) == [3, 4], "graphs were reused for other shapes"
+    # Reallocated weights invalidate the captured graphs
+    instance.load_state_dict({k: v.clone() for k, v in instance.state_dict().items()}, assign=True)
+    assert instance._get_cuda_graphs(inputs) == [5, 6], "graphs were reused after the weights were reallocated"
+
+
+@pytest.mark.parametrize("mode", ["minmax", "standardise", "disable"])
+def test_denormalize(instance, mode):
+    data = np.random.rand(3, N_TIMESTEPS, N_CHEMICALS) * 10 - 2
+    if mode == "disable":
+        data_params, data_norm = {"mode": "disable"}, data
+    else:
+        data_params, data_norm, _, _ = normalize_data(data, mode=mode)
+    instance.normalisation = data_params
+    instance._prepare_denorm_cache()
+    denormalized = instance.denormalize(torch.tensor(data_norm))
+    assert torch.allclose(denormalized, torch.tensor(data)), f"denormalize does not invert normalize_data for mode {mode}"
+
+def test_mass_conservation_loss_2d():
+    masses = torch.rand(N_CHEMICALS)
+    outputs, targets = torch.rand(8, N_CHEMICALS), torch.rand(8, N_CHEMICALS)
+    loss = MassConservationLoss(masses.tolist(), weights=(0.5, 2.0))(outputs, targets)
+
+    # Formula of the original mass_conservation_loss closure
+    standard_loss = torch.nn.MSELoss(reduction="sum")(outputs, targets)
+    mass_loss = torch.abs(torch.sum(outputs * masses, dim=1) - torch.sum(targets * masses, dim=1)).sum()
+    assert torch.allclose(loss, 0.5 * standard_loss + 2.0 * mass_loss), "loss differs from the original formula"
+
+
+def test_mass_conservation_loss_3d():
+    masses = torch.rand(N_CHEMICALS)
+    outputs, targets = torch.rand(4, N_TIMESTEPS, N_CHEMICALS), torch.rand(4, N_TIMESTEPS, N_CHEMICALS)
+    loss = MassConservationLoss(masses.tolist())(outputs, targets)
+
+    # The mass is summed over the chemicals (last dimension) for every sample and timestep
+    standard_loss = torch.nn.MSELoss(reduction="sum")(outputs, targets)
+    mass_loss = torch.abs(torch.sum((outputs - targets) * masses, dim=-1)).sum()
+    assert torch.allclose(loss, standard_loss + mass_loss), "loss does not reduce the mass over the chemicals"
+
+
+def test_mass_conservation_loss_shape_mismatch():
+    loss = MassConservationLoss(torch.rand(N_CHEMICALS).tolist())
+    with pytest.raises(ValueError):
+        loss(torch.rand(4, N_CHEMICALS + 1), torch.rand(4, N_CHEMICALS + 1))
+
 def test_fit(instance, dataloaders):
     dataloader_train, dataloader_test, _ = dataloaders
     instance.fit(dataloader_train, dataloader_test, epochs=2)
@@ -78,3 +156,100 @@ def test_save_load(instance, tmp_path):
         model_dir=tmp_path,
     )
     assert new_instance is not None, "model is None after loading"
+
+
+def test_save_load_array_sidecar(instance, tmp_path):
+    model_name = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(10))
+    # Large enough to exceed SIDECAR_MIN_BYTES even after the cast to float16
+    instance.train_loss = np.random.rand(100_000)
+    instance.save(model_name=model_name, base_dir=tmp_path, training_id="TestID", data_params={})
+    model_dir = tmp_path / "TestID" / instance.__class__.__name__
+    assert (model_dir / f"{model_name}_arrays.npz").exists(), "large array was not saved to the sidecar file"
+
+    new_instance = instance.__class__(DEVICE, N_CHEMICALS, N_TIMESTEPS)
+    new_instance.load(
+        training_id="TestID",
+        surr_name=instance.__class__.__name__,
+        model_identifier=model_name,
+        model_dir=tmp_path,
+    )
+    np.testing.assert_array_equal(new_instance.train_loss, instance.train_loss)
+
+def test_resave_loaded_model(instance, tmp_path):
+    model_name = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(10))
+    save_kwargs = dict(model_name=model_name, base_dir=tmp_path, training_id="TestID", data_params={})
+    load_kwargs = dict(training_id="TestID", surr_name=instance.__class__.__name__, model_identifier=model_name, model_dir=tmp_path)
+    instance.save(**save_kwargs)
+    loaded = instance.__class__(DEVICE, N_CHEMICALS, N_TIMESTEPS)
+    loaded.load(**load_kwargs)
+    # Overwriting the file the loaded weights were read from must not invalidate them
+    loaded.save(**save_kwargs)
+    reloaded = instance.__class__(DEVICE, N_CHEMICALS, N_TIMESTEPS)
+    reloaded.load(**load_kwargs)
+    for key, value in instance.state_dict().items():
+        assert torch.equal(reloaded.state_dict()[key].cpu(), value.cpu()), f"{key} differs after re-saving"
+
+
+def test_load_resets_forward(instance, tmp_path):
+    model_name = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(10))
+    instance.save(model_name=model_name, base_dir=tmp_path, training_id="TestID", data_params={})
+    # Stands in for the torch.compile wrapper set by load(..., compile_inference=True)
+    instance.forward = lambda inputs: None
+    instance.load(
+        training_id="TestID",
+        surr_name=instance.__class__.__name__,
+        model_identifier=model_name,
+        model_dir=tmp_path,
+    )
+    assert "forward" not in instance.__dict__, "forward of a previous load was kept"
+
+class FakeTRTModule(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.register_buffer("engine", torch.zeros(3))
+
+
+@pytest.fixture
+def fake_torch2trt(monkeypatch):
+    def torch2trt(module, inputs, **kwargs):
+        trt_module = FakeTRTModule()
+        trt_module.engine.copy_(torch.arange(3.0))
+        return trt_module
+
+    monkeypatch.setitem(sys.modules, "torch2trt", types.SimpleNamespace(torch2trt=torch2trt, TRTModule=FakeTRTModule))
+
+
+def export_trt_model(instance, tmp_path):
+    model_name = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(10))
+    submodule = next(name for name, module in instance.named_children() if next(module.parameters(), None) is not None)
+    instance.save(model_name=model_name, base_dir=tmp_path, training_id="TestID", data_params={})
+    instance.export_trt(submodule, torch.zeros(4, N_CHEMICALS), model_name, tmp_path, "TestID")
+    return model_name, submodule
+
+
+def test_export_load_trt(instance, tmp_path, fake_torch2trt):
+    model_name, submodule = export_trt_model(instance, tmp_path)
+
+    new_instance = instance.__class__(DEVICE, N_CHEMICALS, N_TIMESTEPS)
+    new_instance.load(
+        training_id="TestID",
+        surr_name=instance.__class__.__name__,
+        model_identifier=model_name,
+        model_dir=tmp_path,
+        use_trt=True,
+    )
+    trt_module = new_instance.get_submodule(submodule)
+    assert isinstance(trt_module, FakeTRTModule), f"{submodule} was not replaced by the TensorRT module"
+    assert torch.equal(trt_module.engine.cpu(), torch.arange(3.0)), "TensorRT engine was not restored"
+
+
+def test_load_after_trt_load(instance, tmp_path, fake_torch2trt):
+    model_name, submodule = export_trt_model(instance, tmp_path)
+    load_kwargs = dict(training_id="TestID", surr_name=instance.__class__.__name__, model_identifier=model_name, model_dir=tmp_path)
+
+    new_instance = instance.__class__(DEVICE, N_CHEMICALS, N_TIMESTEPS)
+    new_instance.load(**load_kwargs, use_trt=True)
+    new_instance.load(**load_kwargs)
+    assert not isinstance(new_instance.get_submodule(submodule), FakeTRTModule), f"{submodule} was not restored"
+    for key, value in instance.state_dict().items():
+        assert torch.equal(new_instance.state_dict()[key].cpu(), value.cpu()), f"{key} differs after reloading"
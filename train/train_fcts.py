@@ -1,7 +1,8 @@
 import os
 from queue import Queue
-from threading import Thread
+from threading import Lock, Thread
 
+import torch
 from tqdm import tqdm
 
 from benchmark.bench_utils import get_model_config, get_surrogate
@@ -15,6 +16,38 @@ from utils import (
 )
 
 
+# Full datasets loaded in this process, shared by all training tasks
+_FULL_DATA: dict[tuple, tuple] = {}
+_FULL_DATA_LOCK = Lock()
+
+
+def _load_full_data(dataset_name: str, log: bool, normalisation_mode: str) -> tuple:
+    """
+    Load the full dataset once per process. The training threads run in the same
+    process, so all tasks share the returned arrays instead of reading the dataset
+    from disk again. The arrays must therefore not be modified in place. The lock
+    makes threads that start at the same time wait for a single load.
+
+    Args:
+        dataset_name (str): The name of the dataset.
+        log (bool): Whether to log-transform the data (log10).
+        normalisation_mode (str): The normalisation mode.
+
+    Returns:
+        tuple: The output of check_and_load_data.
+    """
+    key = (dataset_name, log, normalisation_mode)
+    with _FULL_DATA_LOCK:
+        if key not in _FULL_DATA:
+            _FULL_DATA[key] = check_and_load_data(
+                dataset_name,
+                verbose=False,
+                log=log,
+                normalisation_mode=normalisation_mode,
+            )
+        return _FULL_DATA[key]
+
+
 def train_and_save_model(
     surr_name: str,
     mode: str,
@@ -42,17 +75,23 @@ def train_and_save_model(
     config_path = f"trained/{training_id}/config.yaml"
     config = load_and_save_config(config_path, save=False)
 
+    # Make the assigned GPU the current device of this thread, so that CUDA calls
+    # without an explicit device (e.g. streams, cuBLAS handles) do not land on cuda:0
+    # (a bare "cuda" already refers to the current device)
+    dev = torch.device(device)
+    if torch.cuda.is_available() and dev.type == "cuda" and dev.index is not None:
+        torch.cuda.set_device(dev)
+
     # Set the seed for the training
     if seed is not None:
         set_random_seeds(seed)
 
     # Load full data
     full_train_data, full_test_data, _, timesteps, _, data_params, _ = (
-        check_and_load_data(
+        _load_full_data(
             config["dataset"]["name"],
-            verbose=False,
-            log=config["dataset"]["log10_transform"],
-            normalisation_mode=config["dataset"]["normalise"],
+            config["dataset"]["log10_transform"],
+            config["dataset"]["normalise"],
         )
     )
 
@@ -106,9 +145,11 @@ def train_and_save_model(
         description=description,
     )
 
-    # Save the model (making the name lowercase and removing any underscores)
-    model_name = f"{surr_name.lower()}_{mode}_{str(metric)}".strip("_")
-    model_name = model_name.replace("__", "_")
+    # Save the model (the main model has no metric, e.g. "multionet_main")
+    name_parts = [surr_name.lower(), mode]
+    if str(metric):
+        name_parts.append(str(metric))
+    model_name = "_".join(name_parts)
     base_dir = os.path.join(os.getcwd(), "trained")
     model.save(
         model_name=model_name,
@@ -169,6 +210,23 @@ def create_task_list_for_surrogate(config, surr_name: str) -> list:
     return tasks
 
 
+def _estimate_task_cost(task: tuple) -> float:
+    """
+    Roughly estimate the relative cost of a training task as the number of epochs
+    times the fraction of the data it trains on.
+
+    Args:
+        task (tuple): The training task.
+
+    Returns:
+        float: The estimated cost.
+    """
+    _, mode, metric, _, _, epochs = task
+    if mode in ("interpolation", "sparse"):
+        return epochs / metric
+    return epochs
+
+
 def worker(
     task_queue: Queue,
     device: str,
@@ -212,8 +270,10 @@ def parallel_training(tasks, device_list, task_list_filepath: str):
         device_list (list): The list of devices to use for training.
         task_list_filepath (str): The filepath to the task list file.
     """
+    # The workers pull the next task when they are free, so starting with the
+    # longest tasks keeps a long task from finishing last on a single device
     task_queue = Queue()
-    for task in tasks:
+    for task in sorted(tasks, key=_estimate_task_cost, reverse=True):
         task_queue.put(task)
 
     # Create the overall progress bar
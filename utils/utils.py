@@ -11,17 +11,44 @@ import torch
 import yaml
 from tqdm import tqdm
 
+try:
+    from yaml import CSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as CSafeLoader
 
-def read_yaml_config(config_path):
-    with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
+# Parsed YAML files, keyed by (absolute path, modification time)
+_YAML_CACHE: dict[tuple[str, int], dict] = {}
+
+
+def _load_yaml(config_path: str) -> dict:
+    """
+    Parse a YAML file, reusing the result of earlier calls as long as the file has
+    not been modified since. The cached dict is shared between callers, so it must
+    not be modified in place.
+
+    Args:
+        config_path (str): The path to the YAML file.
+
+    Returns:
+        dict: The parsed YAML file.
+    """
+    key = (os.path.abspath(config_path), os.stat(config_path).st_mtime_ns)
+    config = _YAML_CACHE.get(key)
+    if config is None:
+        with open(config_path, "r", encoding="utf-8") as file:
+            config = yaml.load(file, Loader=CSafeLoader)
+        _YAML_CACHE[key] = config
     return config
 
 
+def read_yaml_config(config_path):
+    return _load_yaml(config_path)
+
+
 def time_execution(func):
     """
     Decorator to time the execution of a function and store the duration
-    as an attribute of the function.
+    (in seconds, measured with a monotonic clock) as an attribute of the function.
 
     Args:
         func (callable): The function to be timed.
@@ -29,10 +56,10 @@ def time_execution(func):
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        wrapper.duration = end_time - start_time
+        end_time = time.perf_counter_ns()
+        wrapper.duration = (end_time - start_time) * 1e-9
         # tqdm.write(f"{func.__name__} executed in {wrapper.duration:.2f} seconds.")
         return result
 
@@ -56,9 +83,8 @@ def create_model_dir(
     """
     full_path = os.path.join(base_dir, subfolder, unique_id)
 
-    # Check if the directory exists, and create it if it doesn't
-    if not os.path.exists(full_path):
-        os.makedirs(full_path)
+    # Create the directory if it doesn't exist (safe if another worker races us)
+    os.makedirs(full_path, exist_ok=True)
 
     return full_path
 
@@ -75,8 +101,7 @@ def load_and_save_config(config_path: str = "config.yaml", save: bool = True) ->
         dict: The loaded configuration dictionary.
     """
     # Load configuration from YAML
-    with open(config_path, "r", encoding="utf-8") as file:
-        config = yaml.safe_load(file)
+    config = _load_yaml(config_path)
 
     if save:
         # Get training ID from the config
@@ -86,26 +111,32 @@ def load_and_save_config(config_path: str = "config.yaml", save: bool = True) ->
         save_dir = os.path.join("trained", training_id)
         os.makedirs(save_dir, exist_ok=True)
 
-        # Copy the config file to the directory
+        # Copy the config file to the directory. This must be a real copy rather than
+        # a hard link: the saved config is the snapshot that check_training_status
+        # compares against, and editors often modify config.yaml in place.
         config_save_path = os.path.join(save_dir, "config.yaml")
         shutil.copyfile(config_path, config_save_path)
 
     return config
 
 
-def set_random_seeds(seed: int):
+def set_random_seeds(seed: int, deterministic: bool = False):
     """
-    Set random seeds for reproducibility.
+    Set random seeds for reproducibility. By default cuDNN is allowed to autotune
+    and pick the fastest (possibly nondeterministic) algorithms, so runs with the
+    same seed may differ slightly; bitwise reproducibility is opt-in.
 
     Args:
         seed (int): The random seed to set.
+        deterministic (bool): Whether to restrict cuDNN to deterministic algorithms
+            and disable autotuning. Default is False.
     """
     random.seed(seed)
     np.random.seed(seed)
     torch.manual_seed(seed)
     torch.cuda.manual_seed_all(seed)
-    torch.backends.cudnn.deterministic = True
-    torch.backends.cudnn.benchmark = False
+    torch.backends.cudnn.deterministic = deterministic
+    torch.backends.cudnn.benchmark = not deterministic
 
 
 def nice_print(message: str, width: int = 80) -> None:
@@ -183,9 +214,9 @@ def worker_init_fn(worker_id):
     Args:
         worker_id (int): The worker ID.
     """
-    torch_seed = torch.initial_seed()
-    np_seed = torch_seed // 2**32 - 1
-    np.random.seed(np_seed)
+    seed = (torch.initial_seed() + worker_id) % 2**32
+    np.random.seed(seed)
+    random.seed(seed)
 
 
 def save_task_list(tasks: list, filepath: str) -> None: